@@ -0,0 +1,98 @@
+"""Micro-benchmark do custo Python por request em listar_adocoes/listar_animais.
+
+Compara a montagem antiga (um select() novo por request, valores literais)
+com as consultas em cache do módulo `consultas`, num SQLite em memória.
+
+Uso:
+    python benchmarks/consultas.py --repeticoes 5000
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import SQLModel, Session, create_engine, select, func
+from sqlalchemy.pool import StaticPool
+
+from consultas import consulta_adocoes, consulta_animais
+from modelos import Animal, Adotante, Atendente, Adocao, AdocaoAtend
+
+def adocoes_antigo(id_atendente, especie, ano, ordenar_recentes):
+    query = select(Adocao)
+    if id_atendente:
+        query = query.join(AdocaoAtend).where(AdocaoAtend.id_atendente == id_atendente)
+    if especie:
+        query = query.join(Animal).where(Animal.especie == especie)
+    if ano:
+        query = query.where(Adocao.data_adocao >= date(ano, 1, 1), Adocao.data_adocao <= date(ano, 12, 31))
+    if ordenar_recentes:
+        query = query.order_by(Adocao.data_adocao.desc())
+    return query, {}
+
+def animais_antigo(nome, status_adocao, ordenar_por_idade):
+    query = select(Animal)
+    if nome:
+        query = query.where(func.lower(Animal.nome).contains(nome.lower()))
+    if status_adocao is not None:
+        query = query.where(Animal.status_adocao == status_adocao)
+    if ordenar_por_idade:
+        query = query.order_by(Animal.idade)
+    return query, {}
+
+def popular(session: Session) -> None:
+    atendente = Atendente(nome="Atendente")
+    adotante = Adotante(nome="Adotante", contato="-", endereco="-", preferencias="Indiferente")
+    session.add_all([atendente, adotante])
+    session.flush()
+    for i in range(20):
+        animal = Animal(nome=f"Animal {i}", especie="Gato" if i % 2 else "Cachorro", idade=i % 10,
+                        data_resgate=date(2024, 1, 1), status_adocao=True)
+        session.add(animal)
+        session.flush()
+        adocao = Adocao(data_adocao=date(2025, 1, 1 + i), descricao="-", cancelamento=False,
+                        id_animal=animal.id_animal, id_adotante=adotante.id_adotante)
+        session.add(adocao)
+        session.flush()
+        session.add(AdocaoAtend(id_adocao=adocao.id_adocao, id_atendente=atendente.id_atendente))
+    session.commit()
+
+def cronometrar(session: Session, montar, combinacoes, repeticoes: int) -> float:
+    """Tempo médio (µs) por request: montar a consulta + executar + materializar."""
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        query, params = montar(*combinacoes[i % len(combinacoes)])
+        session.exec(query, params=params).all()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    combinacoes_adocoes = [(1, "Gato", 2025, True), (None, "Cachorro", None, False), (1, None, 2025, False), (None, None, None, True)]
+    combinacoes_animais = [("anim", True, True), (None, None, False), ("1", None, True), (None, False, False)]
+
+    casos = [
+        ("listar_adocoes", adocoes_antigo, lambda a, e, y, o: consulta_adocoes(id_atendente=a, especie=e, ano=y, ordenar_recentes=o), combinacoes_adocoes),
+        ("listar_animais", animais_antigo, lambda n, s, o: consulta_animais(nome=n, status_adocao=s, ordenar_por_idade=o), combinacoes_animais),
+    ]
+
+    with Session(engine) as session:
+        popular(session)
+        print(f"{'consulta':<16} {'antes (µs)':>12} {'depois (µs)':>12} {'ganho':>7}")
+        for nome, antigo, novo, combinacoes in casos:
+            cronometrar(session, antigo, combinacoes, 200)  # aquecimento
+            cronometrar(session, novo, combinacoes, 200)
+            antes = cronometrar(session, antigo, combinacoes, args.repeticoes)
+            depois = cronometrar(session, novo, combinacoes, args.repeticoes)
+            print(f"{nome:<16} {antes:>12.1f} {depois:>12.1f} {antes / depois:>6.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Perfil de inicialização do app (python -X importtime).
+
+Uso:
+    python benchmarks/startup.py                  # compara com startup_baseline.json
+    python benchmarks/startup.py --orcamento-ms 300
+    python benchmarks/startup.py --salvar-baseline
+
+O piso é o que o app não tem como evitar (`import fastapi, sqlmodel`), medido no mesmo
+processo que importa `main`: o custo próprio do app é o import de `main` menos o piso.
+O orçamento padrão é a proporção custo próprio / piso gravada em startup_baseline.json
+mais --tolerancia (5% do piso), o que vale em máquinas mais lentas ou mais rápidas.
+Sai com código 1 se o custo próprio passar do orçamento ou se alguma dependência
+pesada (Faker, numpy) for carregada no caminho de serviço.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().with_name("startup_baseline.json")
+PROIBIDOS = ("faker", "numpy")
+PISO = ("fastapi", "sqlmodel")
+PROPORCAO_SEM_BASELINE = 1.0  # sem baseline: o app pode custar no máximo um piso
+
+def medir_imports(modulo: str) -> dict[str, int]:
+    """Importa `modulo` num processo novo e devolve {modulo: tempo cumulativo em µs}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"falha ao importar {modulo}:\n{proc.stderr}")
+
+    tempos = {}
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha.removeprefix("import time:").split("|")
+        tempos[nome.strip()] = int(cumulativo)
+    return tempos
+
+def carregar_baseline(modulo: str) -> dict | None:
+    if not BASELINE.exists():
+        return None
+    baseline = json.loads(BASELINE.read_text())
+    if baseline["modulo"] != modulo:
+        return None
+    if baseline["python"] != platform.python_version():
+        print(f"Aviso: baseline medido no Python {baseline['python']}; grave um novo com --salvar-baseline")
+    return baseline
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modulo", default="main")
+    parser.add_argument("--orcamento-ms", type=float, help="custo próprio máximo em ms (padrão: relativo ao piso)")
+    parser.add_argument("--tolerancia", type=float, default=0.05, help="folga sobre o baseline, em fração do piso")
+    parser.add_argument("--repeticoes", type=int, default=5, help="imports medidos; vale a mediana")
+    parser.add_argument("--salvar-baseline", action="store_true", help="grava as medianas em startup_baseline.json")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # piso e app saem do mesmo processo: entre processos a variação (~20% numa VM) é maior
+    # que o custo próprio do app
+    medicoes = [medir_imports(args.modulo) for _ in range(args.repeticoes)]
+    totais = [tempos[args.modulo] / 1000 for tempos in medicoes]
+    pisos = [sum(tempos[nome] for nome in PISO) / 1000 for tempos in medicoes]
+    proprios = [total - piso for total, piso in zip(totais, pisos)]
+    total_ms = statistics.median(totais)
+    piso_ms = statistics.median(pisos)
+    proprio_ms = statistics.median(proprios)
+    proporcao = statistics.median(proprio / piso for proprio, piso in zip(proprios, pisos))
+    tempos = min(medicoes, key=lambda t: abs(t[args.modulo] / 1000 - total_ms))
+
+    if args.salvar_baseline:
+        BASELINE.write_text(json.dumps({
+            "modulo": args.modulo,
+            "piso_ms": round(piso_ms, 1),
+            "import_ms": round(total_ms, 1),
+            "proporcao": round(proporcao, 3),
+            "python": platform.python_version(),
+            "maquina": platform.machine(),
+        }, indent=2) + "\n")
+        print(f"Baseline gravado em {BASELINE.name}: custo próprio {proporcao:.0%} do piso")
+
+    baseline = carregar_baseline(args.modulo)
+    if args.orcamento_ms is not None:
+        orcamento_ms = args.orcamento_ms
+    elif baseline is not None:
+        orcamento_ms = piso_ms * (baseline["proporcao"] + args.tolerancia)
+    else:
+        orcamento_ms = piso_ms * PROPORCAO_SEM_BASELINE
+
+    referencia = f", baseline {baseline['proporcao']:.0%} do piso" if baseline is not None else ""
+    print(f"Import de '{args.modulo}': {total_ms:.1f} ms; piso ({', '.join(PISO)}) {piso_ms:.1f} ms; "
+          f"medianas de {len(totais)}")
+    print(f"Custo próprio do app: {proprio_ms:.1f} ms = {proporcao:.0%} do piso "
+          f"(orçamento {orcamento_ms:.0f} ms{referencia})")
+    print(f"\nTop {args.top} imports (cumulativo):")
+    for nome, us in sorted(tempos.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {nome}")
+
+    falhou = False
+    carregados = [nome for nome in tempos if nome.split(".")[0] in PROIBIDOS]
+    if carregados:
+        print(f"\nERRO: dependências pesadas no caminho de serviço: {', '.join(sorted(carregados))}")
+        falhou = True
+    if proprio_ms > orcamento_ms:
+        print(f"\nERRO: custo próprio de '{args.modulo}' passou do orçamento ({proprio_ms:.1f} ms > {orcamento_ms:.0f} ms)")
+        falhou = True
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Benchmark de throughput (requests/s) por número de workers do servidor.py.
+
+Uso:
+    python benchmarks/throughput.py --workers 1 2 4 --duracao 10 --clientes 32
+
+Para cada quantidade de workers sobe `servidor.py`, espera o `/` responder e
+dispara carga nas rotas GET /animais/ e GET /animais/{id}.
+
+O ganho com mais workers só aparece numa máquina com vários núcleos livres:
+os clientes de carga rodam na mesma máquina e disputam CPU com os workers.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+def esperar_servidor(porta: int, timeout: float = 30.0) -> None:
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=1)
+            conexao.request("GET", "/")
+            if conexao.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"servidor não respondeu na porta {porta}")
+
+def cliente(porta: int, caminhos: list[str], duracao: float) -> tuple[int, int]:
+    """Faz requests em keep-alive até acabar o tempo; devolve (sucessos, erros)."""
+    conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=10)
+    sucessos = erros = 0
+    fim = time.monotonic() + duracao
+    i = 0
+    while time.monotonic() < fim:
+        try:
+            conexao.request("GET", caminhos[i % len(caminhos)])
+            resposta = conexao.getresponse()
+            resposta.read()
+            if resposta.status < 500:
+                sucessos += 1
+            else:
+                erros += 1
+        except (OSError, http.client.HTTPException):
+            erros += 1
+            conexao.close()
+            conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=10)
+        i += 1
+    return sucessos, erros
+
+def medir(porta: int, caminhos: list[str], clientes: int, duracao: float) -> tuple[float, int]:
+    with multiprocessing.Pool(clientes) as pool:
+        resultados = pool.starmap(cliente, [(porta, caminhos[i:] + caminhos[:i], duracao) for i in range(clientes)])
+    sucessos = sum(r[0] for r in resultados)
+    erros = sum(r[1] for r in resultados)
+    return sucessos / duracao, erros
+
+def ids_de_animais(porta: int, quantidade: int = 50) -> list[int]:
+    conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=10)
+    conexao.request("GET", "/animais/")
+    animais = json.loads(conexao.getresponse().read())
+    return [a["id_animal"] for a in animais[:quantidade]] or [1]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--porta", type=int, default=8765)
+    args = parser.parse_args()
+
+    nucleos = os.cpu_count() or 1
+    print(f"núcleos: {nucleos}, clientes: {args.clientes}")
+    if nucleos < 2 * max(args.workers):
+        print(
+            f"aviso: com {nucleos} núcleos os workers e os {args.clientes} clientes disputam CPU; "
+            "os números não medem o ganho de escalar workers. Rode numa máquina com vários núcleos.",
+            file=sys.stderr,
+        )
+    print(f"{'workers':>8} {'rota':<18} {'req/s':>10} {'erros':>7}")
+    for workers in args.workers:
+        servidor = subprocess.Popen(
+            [sys.executable, "servidor.py", "--workers", str(workers), "--port", str(args.porta), "--host", "127.0.0.1"],
+            cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            esperar_servidor(args.porta)
+            rotas = {
+                "/animais/": ["/animais/"],
+                "/animais/{id}": [f"/animais/{i}" for i in ids_de_animais(args.porta)],
+            }
+            for nome, caminhos in rotas.items():
+                rps, erros = medir(args.porta, caminhos, args.clientes, args.duracao)
+                print(f"{workers:>8} {nome:<18} {rps:>10.1f} {erros:>7}")
+        finally:
+            servidor.send_signal(signal.SIGTERM)
+            servidor.wait(timeout=60)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
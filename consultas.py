@@ -0,0 +1,94 @@
+"""Consultas com filtros opcionais reaproveitáveis.
+
+Cada combinação de filtros ativos (o "formato" da consulta) gera um único
+`select()` com parâmetros nomeados (`bindparam`), guardado em cache. Assim o
+mesmo objeto de statement é reutilizado entre requests: os joins não são
+resolvidos de novo e o SQLAlchemy acha o SQL compilado no cache do engine
+sem recalcular a chave. Os valores dos filtros vão em `params`.
+"""
+from datetime import date
+from functools import lru_cache
+from sqlmodel import select, func
+from sqlalchemy import bindparam
+
+from modelos.adocao import Adocao, AdocaoAtend
+from modelos.animal import Animal
+
+# --- Adoções ---
+@lru_cache(maxsize=None)
+def _select_adocoes(por_animal: bool, por_adotante: bool, por_atendente: bool, por_especie: bool,
+                    por_cancelamento: bool, por_ano: bool, ordenar_recentes: bool):
+    query = select(Adocao)
+
+    if por_animal:
+        query = query.where(Adocao.id_animal == bindparam("id_animal"))
+    if por_adotante:
+        query = query.where(Adocao.id_adotante == bindparam("id_adotante"))
+    if por_atendente:
+        query = query.join(AdocaoAtend).where(AdocaoAtend.id_atendente == bindparam("id_atendente"))
+    if por_especie:
+        query = query.join(Animal).where(Animal.especie == bindparam("especie"))
+    if por_cancelamento:
+        query = query.where(Adocao.cancelamento == bindparam("cancelamento"))
+    if por_ano:
+        query = query.where(Adocao.data_adocao >= bindparam("inicio"), Adocao.data_adocao <= bindparam("fim"))
+    if ordenar_recentes:
+        query = query.order_by(Adocao.data_adocao.desc())
+
+    return query
+
+def consulta_adocoes(id_animal: int | None = None, id_adotante: int | None = None, id_atendente: int | None = None,
+                     especie: str | None = None, cancelamento: bool | None = None, ano: int | None = None,
+                     ordenar_recentes: bool = False):
+    """Devolve (statement, params) para listar adoções com os filtros informados."""
+    params = {}
+    if id_animal:
+        params["id_animal"] = id_animal
+    if id_adotante:
+        params["id_adotante"] = id_adotante
+    if id_atendente:
+        params["id_atendente"] = id_atendente
+    if especie:
+        params["especie"] = especie
+    if cancelamento is not None:
+        params["cancelamento"] = cancelamento
+    if ano:
+        params["inicio"] = date(ano, 1, 1)
+        params["fim"] = date(ano, 12, 31)
+
+    query = _select_adocoes(
+        bool(id_animal), bool(id_adotante), bool(id_atendente), bool(especie),
+        cancelamento is not None, bool(ano), ordenar_recentes,
+    )
+    return query, params
+
+# --- Animais ---
+@lru_cache(maxsize=None)
+def _select_animais(por_nome: bool, por_ano_resgate: bool, por_status: bool, ordenar_por_idade: bool):
+    query = select(Animal)
+
+    if por_nome:
+        query = query.where(func.lower(Animal.nome).contains(bindparam("nome")))
+    if por_ano_resgate:
+        query = query.where(Animal.data_resgate >= bindparam("inicio"), Animal.data_resgate <= bindparam("fim"))
+    if por_status:
+        query = query.where(Animal.status_adocao == bindparam("status_adocao"))
+    if ordenar_por_idade:
+        query = query.order_by(Animal.idade)
+
+    return query
+
+def consulta_animais(nome: str | None = None, ano_resgate: int | None = None, status_adocao: bool | None = None,
+                     ordenar_por_idade: bool = False):
+    """Devolve (statement, params) para listar animais com os filtros informados."""
+    params = {}
+    if nome:
+        params["nome"] = nome.lower()
+    if ano_resgate:
+        params["inicio"] = date(ano_resgate, 1, 1)
+        params["fim"] = date(ano_resgate, 12, 31)
+    if status_adocao is not None:
+        params["status_adocao"] = status_adocao
+
+    query = _select_animais(bool(nome), bool(ano_resgate), status_adocao is not None, ordenar_por_idade)
+    return query, params
@@ -1,17 +1,62 @@
 import os
+from functools import lru_cache
 from sqlmodel import create_engine, Session
-from dotenv import load_dotenv
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
+_engine: Engine | None = None
 
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL não definida no .env")
+# Configurações só são lidas quando o engine é realmente necessário (lifespan ou primeira sessão),
+# assim importar este módulo não custa nada no cold start dos workers.
+@lru_cache
+def get_database_url() -> str:
+    from dotenv import load_dotenv
 
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL não definida no .env")
+    return database_url
 
-engine = create_engine(DATABASE_URL, echo=True, connect_args=connect_args)
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        import eventos  # registra os listeners de sessão (versões das tabelas)
+
+        database_url = get_database_url()
+        connect_args = {"check_same_thread": False} if "sqlite" in database_url else {}
+        echo = os.getenv("SQL_ECHO", "true").lower() in ("1", "true", "sim")
+        pool_args = {} if "sqlite" in database_url else {
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            "pool_pre_ping": True,
+        }
+        _engine = create_engine(database_url, echo=echo, connect_args=connect_args, **pool_args)
+    return _engine
+
+def aquecer_engine() -> None:
+    """Abre as conexões do pool de uma vez para o primeiro request não pagar o connect."""
+    engine = get_engine()
+    tamanho = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    conexoes = [engine.connect() for _ in range(tamanho)]
+    for conexao in conexoes:
+        conexao.exec_driver_sql("SELECT 1")
+        conexao.close()
+
+def dispose_engine() -> None:
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+# Após um fork (gunicorn --preload, multiprocessing) o filho não pode reutilizar os sockets do pai:
+# descarta o pool herdado sem fechar as conexões, que continuam sendo do processo pai.
+def _descartar_pool_apos_fork() -> None:
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+os.register_at_fork(after_in_child=_descartar_pool_apos_fork)
 
 def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    with Session(get_engine()) as session:
+        yield session
@@ -0,0 +1,208 @@
+"""Listeners de sessão que rodam dentro da mesma transação das escritas das rotas.
+
+Registrado uma única vez, na criação do engine (database.get_engine).
+"""
+from datetime import datetime
+from sqlalchemy import event, insert, update, delete, inspect, case, text
+from sqlmodel import Session, select, func
+
+from modelos.adocao import Adocao, AdocaoAtend
+from modelos.adotante import Adotante
+from modelos.alteracao import Alteracao
+from modelos.atendente import Atendente
+from modelos.resumo import ResumoAdotante, ResumoAtendente
+from modelos.versao import VersaoTabela
+
+# Tabelas cujas alterações vão para o log e invalidam relatórios em cache
+TABELAS_VERSIONADAS = {"animal", "adotante", "atendente", "adocao", "adocaoatend"}
+
+# Ordem do log sem serializar as escritas:
+# no PostgreSQL as transações gravam em paralelo e `seq` pode ser confirmado fora de ordem
+# (a transação com seq 5 faz commit depois da com seq 6). Antes da primeira linha no log, cada
+# transação pega um advisory lock compartilhado com chave <= o menor seq que ela vai receber
+# (último valor da sequência + 1), solto no commit/rollback. Quem lê só entrega seqs abaixo da
+# menor chave ainda travada (ver limite_estavel); transações que escrevem nunca esperam umas
+# pelas outras.
+# Nos outros bancos (SQLite) as escritas já são serializadas pelo próprio banco; lá a linha
+# "*" de VersaoTabela continua travada por toda transação que escreve no log.
+VERSAO_GLOBAL = "*"
+LOCK_LOG = 7340  # primeira metade das chaves de advisory lock do log
+_CHAVE_LOCK = "eventos.lock_global"
+_ULTIMO_SEQ = "pg_sequence_last_value(pg_get_serial_sequence('alteracao', 'seq')::regclass)"
+
+def _postgres(conexao_ou_sessao) -> bool:
+    bind = conexao_ou_sessao.get_bind() if isinstance(conexao_ou_sessao, Session) else conexao_ou_sessao
+    return bind.dialect.name == "postgresql"
+
+def _objetos_alterados(session: Session) -> list[tuple[object, str]]:
+    objetos = [(obj, "insert") for obj in session.new]
+    objetos += [(obj, "update") for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    objetos += [(obj, "delete") for obj in session.deleted]
+    return [(obj, operacao) for obj, operacao in objetos if getattr(obj, "__tablename__", None) in TABELAS_VERSIONADAS]
+
+def _incrementar_versao(conexao, tabela: str) -> None:
+    resultado = conexao.execute(
+        update(VersaoTabela).where(VersaoTabela.tabela == tabela).values(versao=VersaoTabela.versao + 1)
+    )
+    if resultado.rowcount == 0:
+        conexao.execute(insert(VersaoTabela).values(tabela=tabela, versao=1))
+
+# O lock global (fora do PostgreSQL) é pego no before_flush, antes de o flush travar qualquer
+# linha de negócio, para duas transações nunca travarem `*` e uma linha em ordens diferentes.
+@event.listens_for(Session, "before_flush")
+def travar_log(session: Session, flush_context, instances) -> None:
+    if session.info.get(_CHAVE_LOCK) or not _objetos_alterados(session):
+        return
+    if _postgres(session):
+        # pego antes de reservar qualquer seq: quem lê nunca vê um seq reservado sem o lock
+        session.connection().execute(
+            text(f"SELECT pg_advisory_xact_lock_shared(:classe, (COALESCE({_ULTIMO_SEQ}, 0) + 1)::int)"),
+            {"classe": LOCK_LOG},
+        )
+    else:
+        _incrementar_versao(session.connection(), VERSAO_GLOBAL)
+    session.info[_CHAVE_LOCK] = True
+
+@event.listens_for(Session, "after_transaction_end")
+def liberar_log(session: Session, transaction) -> None:
+    if transaction.parent is None:  # fim da transação de verdade, não de um savepoint
+        session.info.pop(_CHAVE_LOCK, None)
+
+@event.listens_for(Session, "after_flush")
+def registrar_alteracoes(session: Session, flush_context) -> None:
+    alterados = _objetos_alterados(session)
+    if not alterados:
+        return
+
+    agora = datetime.now()
+    session.connection().execute(insert(Alteracao), [
+        {
+            "tabela": obj.__tablename__,
+            "chave": ",".join(str(valor) for valor in inspect(obj).mapper.primary_key_from_instance(obj)),
+            "operacao": operacao,
+            "dados": obj.model_dump(mode="json"),
+            "criada_em": agora,
+        }
+        for obj, operacao in alterados
+    ])
+
+def _valores(obj, atributo: str) -> set[int]:
+    """Valor atual e, se mudou neste flush, o anterior."""
+    historico = inspect(obj).attrs[atributo].history
+    valores = set(historico.added or historico.unchanged or ()) | set(historico.deleted or ())
+    if not valores:
+        valores = {getattr(obj, atributo)}
+    return {valor for valor in valores if valor is not None}
+
+def _recalcular_resumo(conexao, modelo, coluna_id, id_entidade: int, base) -> None:
+    totais = select(
+        func.count(Adocao.id_adocao),
+        func.coalesce(func.sum(case((Adocao.cancelamento, 1), else_=0)), 0),
+        func.max(Adocao.data_adocao),
+    ).select_from(base).where(coluna_id == id_entidade)
+    total, canceladas, ultima = conexao.execute(totais).one()
+
+    # delete + insert é portátil entre SQLite e PostgreSQL; o lock da linha do adotante/atendente
+    # (_travar_entidades) impede duas transações de recriarem o mesmo resumo
+    chave = getattr(modelo, coluna_id.key)
+    conexao.execute(delete(modelo).where(chave == id_entidade))
+    if total:
+        conexao.execute(insert(modelo).values({
+            coluna_id.key: id_entidade, "total_adocoes": total, "canceladas": canceladas, "ultima_adocao": ultima,
+        }))
+
+def _entidades_afetadas(session: Session) -> tuple[set[int], set[int]]:
+    """Adotantes e atendentes cujos resumos mudam com as alterações pendentes/recém-gravadas."""
+    adotantes, atendentes, adocoes = set(), set(), set()
+    for obj, _ in _objetos_alterados(session):
+        if isinstance(obj, Adocao):
+            adotantes |= _valores(obj, "id_adotante")
+            if obj.id_adocao is not None:
+                adocoes.add(obj.id_adocao)
+        elif isinstance(obj, AdocaoAtend):
+            atendentes |= _valores(obj, "id_atendente")
+    if adocoes:
+        # cancelar/editar uma adoção muda o resumo de quem a atendeu
+        vinculados = session.connection().execute(
+            select(AdocaoAtend.id_atendente).where(AdocaoAtend.id_adocao.in_(adocoes))
+        )
+        atendentes |= set(vinculados.scalars())
+    return adotantes, atendentes
+
+def _travar_entidades(conexao, adotantes: set[int], atendentes: set[int]) -> None:
+    """Trava as linhas dos adotantes/atendentes (sempre na mesma ordem) até o commit.
+
+    Quem chega depois espera e, em READ COMMITTED, já conta as adoções de quem travou primeiro.
+    No SQLite o FOR UPDATE não existe, mas lá as escritas já são serializadas.
+    """
+    for coluna_id, ids in ((Adotante.id_adotante, adotantes), (Atendente.id_atendente, atendentes)):
+        if ids:
+            conexao.execute(select(coluna_id).where(coluna_id.in_(ids)).order_by(coluna_id).with_for_update())
+
+# Pego no before_flush, antes de o flush gravar adoções/vínculos. Sem o lock global as transações
+# só não se travam em ordens opostas se todas seguirem a mesma: as rotas de adoção travam o animal
+# primeiro (routes/adocao.py) e os adotantes/atendentes são travados aqui, depois dele.
+@event.listens_for(Session, "before_flush")
+def travar_resumos(session: Session, flush_context, instances) -> None:
+    adotantes, atendentes = _entidades_afetadas(session)
+    if adotantes or atendentes:
+        _travar_entidades(session.connection(), adotantes, atendentes)
+
+@event.listens_for(Session, "after_flush")
+def atualizar_resumos(session: Session, flush_context) -> None:
+    adotantes, atendentes = _entidades_afetadas(session)
+    if not (adotantes or atendentes):
+        return
+
+    conexao = session.connection()
+    _travar_entidades(conexao, adotantes, atendentes)  # já travados no before_flush, salvo vínculos novos
+    for id_adotante in sorted(adotantes):
+        _recalcular_resumo(conexao, ResumoAdotante, Adocao.id_adotante, id_adotante, Adocao)
+    base_atendente = Adocao.__table__.join(AdocaoAtend.__table__)
+    for id_atendente in sorted(atendentes):
+        _recalcular_resumo(conexao, ResumoAtendente, AdocaoAtend.id_atendente, id_atendente, base_atendente)
+
+def limite_estavel(session: Session) -> int | None:
+    """Maior seq que nenhuma transação ainda aberta pode preceder (None = sem limite, fora do PostgreSQL).
+
+    Lê o último seq reservado e só depois os locks: um seq reservado antes da primeira leitura
+    ou já terminou ou aparece na segunda com chave menor ou igual a ele.
+    """
+    if not _postgres(session):
+        return None
+    ultimo = session.exec(text(f"SELECT COALESCE({_ULTIMO_SEQ}, 0)")).scalar_one()
+    menor_aberto = session.exec(
+        text(
+            "SELECT min(objid::text::bigint) FROM pg_locks "
+            "WHERE locktype = 'advisory' AND classid = :classe AND objsubid = 2 AND granted"
+        ),
+        params={"classe": LOCK_LOG},
+    ).scalar_one()
+    return ultimo if menor_aberto is None else min(ultimo, menor_aberto - 1)
+
+def alteracoes_estaveis(session: Session, since: int, limite: int, tabela: str | None = None) -> list[Alteracao]:
+    """Alterações com seq > since que já não podem ganhar um seq menor confirmado depois.
+
+    As que passam do limite saem numa próxima leitura, quando as transações abertas terminarem.
+    """
+    query = select(Alteracao).where(Alteracao.seq > since)
+    estavel = limite_estavel(session)
+    if estavel is not None:
+        query = query.where(Alteracao.seq <= estavel)
+    if tabela:
+        query = query.where(Alteracao.tabela == tabela)
+    return session.exec(query.order_by(Alteracao.seq).limit(limite)).all()
+
+def versoes_atuais(session: Session) -> dict:
+    """Posição do log que identifica o estado atual das tabelas versionadas.
+
+    `estavel` é o maior seq já definitivo (nada abaixo dele ainda pode aparecer) e `depois`
+    lista os seqs confirmados acima dele. Qualquer escrita confirmada muda o resultado.
+    """
+    limite = limite_estavel(session)
+    definitivas = select(func.max(Alteracao.seq))
+    if limite is not None:
+        definitivas = definitivas.where(Alteracao.seq <= limite)
+    estavel = session.exec(definitivas).one() or 0
+    depois = session.exec(select(Alteracao.seq).where(Alteracao.seq > estavel).order_by(Alteracao.seq)).all()
+    return {"estavel": estavel, "depois": list(depois)}
@@ -1,11 +1,27 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from database import engine
-from routes import animal,adotante,atendente,adocao
+from sqlmodel import Session
+from database import get_engine, dispose_engine, aquecer_engine
+from routes import animal,adotante,atendente,adocao,tarefa,alteracao
+from modelos import Animal, Adotante, Atendente, Adocao
+from tarefas import gerenciador
+
+def aquecer_cache_sql():
+    # Executa uma vez as consultas por ID para já deixar o SQL compilado no cache do engine
+    with Session(get_engine()) as session:
+        for modelo in (Animal, Adotante, Atendente, Adocao):
+            session.get(modelo, 0)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Engine e configurações são criados aqui (e não no import) para o cold start ficar barato
+    get_engine()
+    aquecer_engine()
+    aquecer_cache_sql()
+    gerenciador.iniciar()
     yield
+    gerenciador.parar()
+    dispose_engine()
 
 app = FastAPI(
     title="Sistema de Adoção de Animais",
@@ -17,6 +33,8 @@ app.include_router(animal.router)
 app.include_router(adotante.router)
 app.include_router(atendente.router)
 app.include_router(adocao.router)
+app.include_router(tarefa.router)
+app.include_router(alteracao.router)
 
 @app.get("/")
 def root():
@@ -5,7 +5,7 @@ from alembic import context
 from sqlmodel import SQLModel
 from dotenv import load_dotenv
 import os
-from modelos import *
+import modelos  # registra as tabelas no SQLModel.metadata
 
 load_dotenv()
 
@@ -2,6 +2,10 @@ from .animal import Animal
 from .adotante import Adotante
 from .atendente import Atendente
 from .adocao import Adocao, AdocaoAtend
+from .tarefa import Tarefa
+from .versao import VersaoTabela
+from .alteracao import Alteracao
+from .resumo import ResumoAdotante, ResumoAtendente
 
 __all__ = [
     "Animal",
@@ -9,4 +13,9 @@ __all__ = [
     "Atendente",
     "Adocao",
     "AdocaoAtend",
+    "Tarefa",
+    "VersaoTabela",
+    "Alteracao",
+    "ResumoAdotante",
+    "ResumoAtendente",
 ]
\ No newline at end of file
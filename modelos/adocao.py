@@ -14,8 +14,8 @@ class AdocaoBase(SQLModel):
 
 class Adocao(AdocaoBase, table=True):
     id_adocao: int | None = Field(default=None, primary_key=True)
-    id_animal: int = Field(foreign_key="animal.id_animal")
-    id_adotante: int = Field(foreign_key="adotante.id_adotante")
+    id_animal: int = Field(foreign_key="animal.id_animal", index=True)
+    id_adotante: int = Field(foreign_key="adotante.id_adotante", index=True)
 
     animal: "Animal" = Relationship(back_populates="adocoes")
     adotante: "Adotante" = Relationship(back_populates="adocoes")
@@ -24,7 +24,7 @@ class Adocao(AdocaoBase, table=True):
 #tabela de associação
 class AdocaoAtend(SQLModel, table=True):
     id_adocao: int = Field(foreign_key="adocao.id_adocao", primary_key=True)
-    id_atendente: int = Field(foreign_key="atendente.id_atendente", primary_key=True)
+    id_atendente: int = Field(foreign_key="atendente.id_atendente", primary_key=True, index=True)
 
     adocao: "Adocao" = Relationship(back_populates="atendentes")
     atendente: "Atendente" = Relationship(back_populates="adocao_links")
@@ -0,0 +1,12 @@
+from datetime import datetime
+from sqlalchemy import JSON
+from sqlmodel import SQLModel, Field
+
+# Log de alterações (append-only), escrito na mesma transação de cada escrita (ver eventos.py)
+class Alteracao(SQLModel, table=True):
+    seq: int | None = Field(default=None, primary_key=True)
+    tabela: str
+    chave: str  # valor(es) da chave primária, separados por vírgula
+    operacao: str  # insert, update, delete
+    dados: dict | None = Field(default=None, sa_type=JSON)  # estado da linha após a operação (ou antes, no delete)
+    criada_em: datetime = Field(default_factory=datetime.now)
@@ -0,0 +1,14 @@
+from datetime import date
+from sqlmodel import SQLModel, Field
+
+# Resumos pré-calculados do histórico, mantidos em sincronia pelas escritas em adocao/adocaoatend (ver eventos.py)
+class ResumoBase(SQLModel):
+    total_adocoes: int = Field(default=0, index=True)
+    canceladas: int = 0
+    ultima_adocao: date | None = None
+
+class ResumoAdotante(ResumoBase, table=True):
+    id_adotante: int = Field(foreign_key="adotante.id_adotante", primary_key=True)
+
+class ResumoAtendente(ResumoBase, table=True):
+    id_atendente: int = Field(foreign_key="atendente.id_atendente", primary_key=True)
@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class ParametrosRelatorio(SQLModel):
+    ano: int | None = None      # ano da adoção
+    especie: str | None = None
+
+class TarefaCreate(ParametrosRelatorio):
+    relatorio: str  # "detalhes" ou "animais-adotados"
+
+# O que a API mostra de uma tarefa (sem o caminho do arquivo no servidor nem a chave de cache)
+class TarefaPublica(SQLModel):
+    id_tarefa: int
+    relatorio: str
+    parametros: ParametrosRelatorio
+    status: str
+    tentativas: int
+    criada_em: datetime
+    iniciada_em: datetime | None
+    concluida_em: datetime | None
+    erro: str | None
+
+class Tarefa(SQLModel, table=True):
+    id_tarefa: int | None = Field(default=None, primary_key=True)
+    relatorio: str
+    parametros: str  # JSON dos ParametrosRelatorio
+    chave: str = Field(index=True)  # hash de relatório + parâmetros + versão das tabelas
+    status: str = Field(default="pendente", index=True)  # pendente, executando, concluida, erro
+    criada_em: datetime = Field(default_factory=datetime.now)
+    tentativas: int = 0
+    iniciada_em: datetime | None = None
+    batimento_em: datetime | None = None  # último sinal de vida do processo que executa a tarefa
+    concluida_em: datetime | None = None
+    arquivo: str | None = None
+    erro: str | None = None
@@ -0,0 +1,6 @@
+from sqlmodel import SQLModel, Field
+
+# Contador de alterações por tabela, incrementado na mesma transação de cada escrita (ver eventos.py)
+class VersaoTabela(SQLModel, table=True):
+    tabela: str = Field(primary_key=True)
+    versao: int = 0
@@ -0,0 +1,56 @@
+"""Relatórios de adoções, usados pelas rotas síncronas e pela fila de tarefas (tarefas.py)."""
+from datetime import date
+from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+
+from modelos.adocao import Adocao, AdocaoAtend
+from modelos.animal import Animal
+from modelos.adotante import Adotante
+
+def _filtrar(query, ano: int | None, especie: str | None):
+    if ano:
+        query = query.where(Adocao.data_adocao >= date(ano, 1, 1), Adocao.data_adocao <= date(ano, 12, 31))
+    if especie:
+        query = query.where(Animal.especie == especie)
+    # carrega atendentes de todas as adoções em uma consulta, em vez de uma por adoção
+    return query.options(selectinload(Adocao.atendentes).selectinload(AdocaoAtend.atendente))
+
+def adocoes_detalhadas(session: Session, ano: int | None = None, especie: str | None = None) -> list[dict]:
+    query = select(Adocao, Animal, Adotante).join(Animal).join(Adotante)
+    resultados = session.exec(_filtrar(query, ano, especie)).all()
+    lista_detalhada = []
+    for adocao, animal, adotante in resultados:
+        atendentes_nomes = [link.atendente.nome for link in adocao.atendentes if link.atendente]
+        lista_detalhada.append({
+            "id_adocao": adocao.id_adocao,
+            "data": adocao.data_adocao,
+            "animal": {"nome": animal.nome},
+            "adotante": {"nome": adotante.nome},
+            "atendentes": atendentes_nomes
+        })
+    return lista_detalhada
+
+def animais_adotados(session: Session, ano: int | None = None, especie: str | None = None) -> list[dict]:
+    """Requisito G: Animais adotados com dados completos"""
+    query = select(Adocao, Animal, Adotante).where(Adocao.id_animal == Animal.id_animal).where(Adocao.id_adotante == Adotante.id_adotante)
+    resultados = session.exec(_filtrar(query, ano, especie)).all()
+    relatorio = []
+    for adocao, animal, adotante in resultados:
+        if not animal.status_adocao: continue
+
+        lista_atendentes = []
+        for link in adocao.atendentes:
+            if link.atendente:
+                lista_atendentes.append({"id": link.atendente.id_atendente, "nome": link.atendente.nome})
+
+        relatorio.append({
+            "animal": {"id": animal.id_animal, "nome": animal.nome, "especie": animal.especie},
+            "adotante": {"id": adotante.id_adotante, "nome": adotante.nome},
+            "dados_adocao": {"data": adocao.data_adocao, "atendentes": lista_atendentes}
+        })
+    return relatorio
+
+RELATORIOS = {
+    "detalhes": adocoes_detalhadas,
+    "animais-adotados": animais_adotados,
+}
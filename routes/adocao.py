@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from sqlmodel import Session
+from sqlalchemy import update
 from typing import List
-from datetime import date
 from database import get_session
+from consultas import consulta_adocoes
+import relatorios
 
 from modelos.adocao import Adocao, AdocaoBase, AdocaoAtend
 from modelos.animal import Animal
@@ -36,19 +38,31 @@ def realizar_adocao(adocao_in: AdocaoCreate, session: Session = Depends(get_sess
             raise HTTPException(status_code=404, detail=f"Atendente {id_atend} não encontrado")
 
     try:
-        # 2. Criação da Adoção
+        # 2. Reserva o animal: o UPDATE condicional espera outra adoção em andamento do mesmo
+        # animal e só troca o status se ele ainda estiver disponível depois dela
+        reserva = session.exec(
+            update(Animal)
+            .where(Animal.id_animal == animal.id_animal, Animal.status_adocao == False)
+            .values(status_adocao=True)
+            .execution_options(synchronize_session=False)
+        )
+        if reserva.rowcount == 0:
+            session.rollback()
+            raise HTTPException(status_code=400, detail="Este animal já foi adotado!")
+
+        # 3. Criação da Adoção
         dados_adocao = adocao_in.model_dump(exclude={"ids_atendentes"})
         nova_adocao = Adocao.model_validate(dados_adocao)
         
         session.add(nova_adocao)
         session.flush()
 
-        # 3. Relacionamento N:M
+        # 4. Relacionamento N:M
         for id_atend in adocao_in.ids_atendentes:
             link = AdocaoAtend(id_adocao=nova_adocao.id_adocao, id_atendente=id_atend)
             session.add(link)
 
-        # 4. Atualizar Status do Animal
+        # 5. Atualizar Status do Animal (pelo ORM, para entrar no log de alterações)
         animal.status_adocao = True
         session.add(animal)
 
@@ -56,6 +70,8 @@ def realizar_adocao(adocao_in: AdocaoCreate, session: Session = Depends(get_sess
         session.refresh(nova_adocao)
         return nova_adocao
 
+    except HTTPException:
+        raise
     except Exception as e:
         session.rollback() 
         raise HTTPException(status_code=500, detail=f"Erro ao processar adoção: {e}")
@@ -72,26 +88,16 @@ def listar_adocoes(
     ano: int | None = Query(None, description="Filtrar por ano da adoção (ex: 2025)"),
     ordenar_recentes: bool = Query(False, description="Se True, ordena da mais recente para a mais antiga")
 ):
-    query = select(Adocao)
-
-    if id_animal:
-        query = query.where(Adocao.id_animal == id_animal)
-    if id_adotante:
-        query = query.where(Adocao.id_adotante == id_adotante)
-    if id_atendente:
-        query = query.join(AdocaoAtend).where(AdocaoAtend.id_atendente == id_atendente)
-    if especie:
-        query = query.join(Animal).where(Animal.especie == especie)
-    if cancelamento is not None:
-        query = query.where(Adocao.cancelamento == cancelamento)
-    if ano:
-        start_date = date(ano, 1, 1)
-        end_date = date(ano, 12, 31)
-        query = query.where(Adocao.data_adocao >= start_date, Adocao.data_adocao <= end_date)
-    if ordenar_recentes:
-        query = query.order_by(Adocao.data_adocao.desc())
-
-    return session.exec(query).all()
+    query, params = consulta_adocoes(
+        id_animal=id_animal,
+        id_adotante=id_adotante,
+        id_atendente=id_atendente,
+        especie=especie,
+        cancelamento=cancelamento,
+        ano=ano,
+        ordenar_recentes=ordenar_recentes,
+    )
+    return session.exec(query, params=params).all()
 
 # --- READ (Por ID) ---
 @router.get("/{id_adocao}", response_model=Adocao)
@@ -148,7 +154,9 @@ def deletar_adocao(id_adocao: int, session: Session = Depends(get_session)):
 
     try:
         # Se deletar a adoção, o animal volta a ficar disponível!
-        animal = session.get(Animal, adocao.id_animal)
+        # O animal é travado antes de tudo, na mesma ordem de realizar_adocao (animal, depois
+        # adotante/atendentes), para duas transações não se esperarem em ordens trocadas
+        animal = session.get(Animal, adocao.id_animal, with_for_update=True)
         if animal:
             animal.status_adocao = False
             session.add(animal)
@@ -165,39 +173,12 @@ def deletar_adocao(id_adocao: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Erro ao deletar adoção: {e}")
 
 # --- RELATÓRIOS ---
+# Para execuções grandes use a fila assíncrona em /tarefas (routes/tarefa.py)
 @router.get("/relatorio/detalhes") 
 def listar_adocoes_detalhadas(session: Session = Depends(get_session)):
-    query = select(Adocao, Animal, Adotante).join(Animal).join(Adotante)
-    resultados = session.exec(query).all()
-    lista_detalhada = []
-    for adocao, animal, adotante in resultados:
-        atendentes_nomes = [link.atendente.nome for link in adocao.atendentes if link.atendente]
-        lista_detalhada.append({
-            "id_adocao": adocao.id_adocao,
-            "data": adocao.data_adocao,
-            "animal": {"nome": animal.nome},
-            "adotante": {"nome": adotante.nome},
-            "atendentes": atendentes_nomes
-        })
-    return lista_detalhada
+    return relatorios.adocoes_detalhadas(session)
 
 @router.get("/relatorio/animais-adotados")
 def relatorio_animais_adotados(session: Session = Depends(get_session)):
     """Requisito G: Animais adotados com dados completos"""
-    query = select(Adocao, Animal, Adotante).where(Adocao.id_animal == Animal.id_animal).where(Adocao.id_adotante == Adotante.id_adotante)
-    resultados = session.exec(query).all()
-    relatorio = []
-    for adocao, animal, adotante in resultados:
-        if not animal.status_adocao: continue
-        
-        lista_atendentes = []
-        for link in adocao.atendentes:
-            if link.atendente:
-                lista_atendentes.append({"id": link.atendente.id_atendente, "nome": link.atendente.nome})
-
-        relatorio.append({
-            "animal": {"id": animal.id_animal, "nome": animal.nome, "especie": animal.especie},
-            "adotante": {"id": adotante.id_adotante, "nome": adotante.nome},
-            "dados_adocao": {"data": adocao.data_adocao, "atendentes": lista_atendentes}
-        })
-    return relatorio
+    return relatorios.animais_adotados(session)
@@ -3,6 +3,9 @@ from sqlmodel import Session, select, func
 from typing import List
 from database import get_session
 from modelos.adotante import Adotante, AdotanteBase
+from modelos.adocao import Adocao
+from modelos.animal import Animal
+from modelos.resumo import ResumoAdotante
 
 router = APIRouter(prefix="/adotantes", tags=["Adotantes"])
 
@@ -65,4 +68,58 @@ def deletar_adotante(adotante_id: int, session: Session = Depends(get_session)):
     
     session.delete(db_adotante)
     session.commit()
-    return {"message": "Adotante removido com sucesso"}
\ No newline at end of file
+    return {"message": "Adotante removido com sucesso"}
+
+# --- HISTÓRICO (Animais adotados por um adotante) ---
+@router.get("/{adotante_id}/historico")
+def historico_adotante(
+    adotante_id: int,
+    session: Session = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limite: int = Query(50, ge=1, le=500)
+):
+    adotante = session.get(Adotante, adotante_id)
+    if not adotante:
+        raise HTTPException(status_code=404, detail="Adotante não encontrado")
+
+    resumo = session.get(ResumoAdotante, adotante_id) or ResumoAdotante(id_adotante=adotante_id)
+    query = (
+        select(Adocao, Animal)
+        .join(Animal)
+        .where(Adocao.id_adotante == adotante_id)
+        .order_by(Adocao.data_adocao.desc(), Adocao.id_adocao.desc())
+        .offset(offset)
+        .limit(limite)
+    )
+    adocoes = [
+        {
+            "id_adocao": adocao.id_adocao,
+            "data_adocao": adocao.data_adocao,
+            "cancelamento": adocao.cancelamento,
+            "animal": {"id": animal.id_animal, "nome": animal.nome, "especie": animal.especie},
+        }
+        for adocao, animal in session.exec(query).all()
+    ]
+    return {
+        "adotante": {"id": adotante.id_adotante, "nome": adotante.nome},
+        "resumo": resumo.model_dump(exclude={"id_adotante"}),
+        "offset": offset,
+        "limite": limite,
+        "adocoes": adocoes,
+    }
+
+@router.get("/stats/mais-ativos")
+def adotantes_mais_ativos(
+    session: Session = Depends(get_session),
+    limite: int = Query(10, ge=1, le=100)
+):
+    query = (
+        select(ResumoAdotante, Adotante.nome)
+        .join(Adotante)
+        .order_by(ResumoAdotante.total_adocoes.desc(), ResumoAdotante.id_adotante)
+        .limit(limite)
+    )
+    return [
+        {"id": resumo.id_adotante, "nome": nome, **resumo.model_dump(exclude={"id_adotante"})}
+        for resumo, nome in session.exec(query).all()
+    ]
@@ -0,0 +1,66 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, SQLModel
+from typing import List
+from database import get_engine, get_session
+from eventos import alteracoes_estaveis
+from modelos.alteracao import Alteracao
+
+router = APIRouter(prefix="/changes", tags=["Alterações"])
+
+INTERVALO_STREAM = 1.0   # segundos entre consultas quando não há alterações novas
+KEEP_ALIVE = 15          # ciclos ociosos entre comentários de keep-alive
+
+class LoteAlteracoes(SQLModel):
+    alteracoes: List[Alteracao]
+    ultimo_seq: int   # use como `since` na próxima chamada
+    tem_mais: bool
+
+# --- READ (Feed em lotes) ---
+@router.get("/", response_model=LoteAlteracoes)
+def listar_alteracoes(
+    session: Session = Depends(get_session),
+    since: int = Query(0, ge=0, description="Retorna alterações com seq maior que este valor"),
+    limite: int = Query(500, ge=1, le=5000, description="Tamanho máximo do lote"),
+    tabela: str | None = Query(None, description="Filtrar por tabela (animal, adotante, atendente, adocao, adocaoatend)")
+):
+    alteracoes = alteracoes_estaveis(session, since, limite, tabela)
+    ultimo_seq = alteracoes[-1].seq if alteracoes else since
+    return LoteAlteracoes(alteracoes=alteracoes, ultimo_seq=ultimo_seq, tem_mais=len(alteracoes) == limite)
+
+# --- READ (Stream SSE) ---
+@router.get("/stream")
+async def stream_alteracoes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Começa depois deste seq"),
+    tabela: str | None = Query(None, description="Filtrar por tabela"),
+    last_event_id: int | None = Header(None, description="Enviado pelo EventSource ao reconectar")
+):
+    def buscar(ultimo: int) -> list[dict]:
+        with Session(get_engine()) as session:
+            return [a.model_dump(mode="json") for a in alteracoes_estaveis(session, ultimo, 500, tabela)]
+
+    async def eventos():
+        ultimo = last_event_id if last_event_id is not None else since
+        ociosos = 0
+        while not await request.is_disconnected():
+            lote = await run_in_threadpool(buscar, ultimo)
+            for alteracao in lote:
+                ultimo = alteracao["seq"]
+                yield f"id: {ultimo}\nevent: alteracao\ndata: {json.dumps(alteracao, ensure_ascii=False)}\n\n"
+            if lote:
+                ociosos = 0
+                continue
+            ociosos += 1
+            if ociosos % KEEP_ALIVE == 0:
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(INTERVALO_STREAM)
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
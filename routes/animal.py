@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select, func
 from typing import List
-from datetime import date
 from database import get_session
+from consultas import consulta_animais
 from modelos.animal import Animal, AnimalBase
 
 router = APIRouter(prefix="/animais", tags=["Animais"])
@@ -29,23 +29,13 @@ def listar_animais(
     status_adocao: bool | None = Query(None, description="Filtro: Status (True=Adotado, False=Disponível)"),
     ordenar_por_idade: bool = Query(False, description="Ordenar do mais novo ao mais velho")
 ):
-    query = select(Animal)
-
-    if nome:
-        query = query.where(func.lower(Animal.nome).contains(nome.lower()))
-    
-    if ano_resgate:
-        start_date = date(ano_resgate, 1, 1)
-        end_date = date(ano_resgate, 12, 31)
-        query = query.where(Animal.data_resgate >= start_date, Animal.data_resgate <= end_date)
-
-    if status_adocao is not None:
-        query = query.where(Animal.status_adocao == status_adocao)
-
-    if ordenar_por_idade:
-        query = query.order_by(Animal.idade)
-
-    return session.exec(query).all()
+    query, params = consulta_animais(
+        nome=nome,
+        ano_resgate=ano_resgate,
+        status_adocao=status_adocao,
+        ordenar_por_idade=ordenar_por_idade,
+    )
+    return session.exec(query, params=params).all()
 
 # --- READ (Buscar por ID) ---
 @router.get("/{animal_id}", response_model=Animal)
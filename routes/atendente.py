@@ -3,6 +3,10 @@ from sqlmodel import Session, select, func
 from typing import List
 from database import get_session
 from modelos.atendente import Atendente, AtendenteBase
+from modelos.adocao import Adocao, AdocaoAtend
+from modelos.adotante import Adotante
+from modelos.animal import Animal
+from modelos.resumo import ResumoAtendente
 
 router = APIRouter(prefix="/atendentes", tags=["Atendentes"])
 
@@ -65,4 +69,61 @@ def deletar_atendente(atendente_id: int, session: Session = Depends(get_session)
     
     session.delete(db_atendente)
     session.commit()
-    return {"message": "Atendente removido com sucesso"}
\ No newline at end of file
+    return {"message": "Atendente removido com sucesso"}
+
+# --- HISTÓRICO (Adoções de um atendente) ---
+@router.get("/{atendente_id}/historico")
+def historico_atendente(
+    atendente_id: int,
+    session: Session = Depends(get_session),
+    offset: int = Query(0, ge=0),
+    limite: int = Query(50, ge=1, le=500)
+):
+    atendente = session.get(Atendente, atendente_id)
+    if not atendente:
+        raise HTTPException(status_code=404, detail="Atendente não encontrado")
+
+    resumo = session.get(ResumoAtendente, atendente_id) or ResumoAtendente(id_atendente=atendente_id)
+    query = (
+        select(Adocao, Animal, Adotante)
+        .join(AdocaoAtend, AdocaoAtend.id_adocao == Adocao.id_adocao)
+        .join(Animal, Animal.id_animal == Adocao.id_animal)
+        .join(Adotante, Adotante.id_adotante == Adocao.id_adotante)
+        .where(AdocaoAtend.id_atendente == atendente_id)
+        .order_by(Adocao.data_adocao.desc(), Adocao.id_adocao.desc())
+        .offset(offset)
+        .limit(limite)
+    )
+    adocoes = [
+        {
+            "id_adocao": adocao.id_adocao,
+            "data_adocao": adocao.data_adocao,
+            "cancelamento": adocao.cancelamento,
+            "animal": {"id": animal.id_animal, "nome": animal.nome, "especie": animal.especie},
+            "adotante": {"id": adotante.id_adotante, "nome": adotante.nome},
+        }
+        for adocao, animal, adotante in session.exec(query).all()
+    ]
+    return {
+        "atendente": {"id": atendente.id_atendente, "nome": atendente.nome},
+        "resumo": resumo.model_dump(exclude={"id_atendente"}),
+        "offset": offset,
+        "limite": limite,
+        "adocoes": adocoes,
+    }
+
+@router.get("/stats/mais-ativos")
+def atendentes_mais_ativos(
+    session: Session = Depends(get_session),
+    limite: int = Query(10, ge=1, le=100)
+):
+    query = (
+        select(ResumoAtendente, Atendente.nome)
+        .join(Atendente)
+        .order_by(ResumoAtendente.total_adocoes.desc(), ResumoAtendente.id_atendente)
+        .limit(limite)
+    )
+    return [
+        {"id": resumo.id_atendente, "nome": nome, **resumo.model_dump(exclude={"id_atendente"})}
+        for resumo, nome in session.exec(query).all()
+    ]
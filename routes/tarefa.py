@@ -0,0 +1,55 @@
+from pathlib import Path
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlmodel import Session
+from database import get_session
+from modelos.tarefa import Tarefa, TarefaCreate, TarefaPublica, ParametrosRelatorio
+from relatorios import RELATORIOS
+from tarefas import gerenciador, FilaCheiaError
+
+router = APIRouter(prefix="/tarefas", tags=["Tarefas"])
+
+def tarefa_publica(tarefa: Tarefa) -> TarefaPublica:
+    dados = tarefa.model_dump(exclude={"parametros", "arquivo", "chave"})
+    return TarefaPublica(**dados, parametros=ParametrosRelatorio.model_validate_json(tarefa.parametros))
+
+# --- CREATE (Submeter Relatório) ---
+@router.post("/", response_model=TarefaPublica, status_code=202)
+def submeter_relatorio(tarefa_in: TarefaCreate, session: Session = Depends(get_session)):
+    if tarefa_in.relatorio not in RELATORIOS:
+        raise HTTPException(status_code=400, detail=f"Relatório inválido. Opções: {', '.join(RELATORIOS)}")
+
+    parametros = ParametrosRelatorio.model_validate(tarefa_in.model_dump(exclude={"relatorio"}))
+    try:
+        tarefa = gerenciador.submeter(session, tarefa_in.relatorio, parametros)
+    except FilaCheiaError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return tarefa_publica(tarefa)
+
+# --- READ (Status) ---
+@router.get("/{id_tarefa}", response_model=TarefaPublica)
+def status_tarefa(id_tarefa: int, session: Session = Depends(get_session)):
+    tarefa = session.get(Tarefa, id_tarefa)
+    if not tarefa:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    return tarefa_publica(tarefa)
+
+# --- READ (Resultado) ---
+@router.get("/{id_tarefa}/resultado")
+def baixar_resultado(id_tarefa: int, session: Session = Depends(get_session)):
+    tarefa = session.get(Tarefa, id_tarefa)
+    if not tarefa:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    if tarefa.status == "erro":
+        raise HTTPException(status_code=500, detail=f"Tarefa falhou: {tarefa.erro}")
+    if tarefa.status != "concluida":
+        raise HTTPException(status_code=409, detail=f"Tarefa ainda não concluída (status: {tarefa.status})")
+    if not tarefa.arquivo or not Path(tarefa.arquivo).exists():
+        raise HTTPException(status_code=410, detail="Resultado substituído por uma execução mais nova ou removido; submeta o relatório de novo")
+
+    # O arquivo já está comprimido: o cliente HTTP descomprime pelo Content-Encoding
+    return FileResponse(
+        tarefa.arquivo,
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip"},
+    )
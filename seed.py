@@ -1,7 +1,7 @@
 import random
 from sqlmodel import Session, select
 from faker import Faker
-from database import engine
+from database import get_engine
 
 from modelos.animal import Animal
 from modelos.adotante import Adotante
@@ -11,7 +11,7 @@ from modelos.adocao import Adocao, AdocaoAtend
 fake = Faker('pt_BR')
 
 def povoar_banco():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         print("--- Iniciando Povoamento Automático ---")
 
         print("Criando 10 Atendentes...")
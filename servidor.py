@@ -0,0 +1,54 @@
+"""Entrada de produção: vários workers uvicorn com loop/parser otimizados.
+
+Uso:
+    python servidor.py --workers 4 --port 8000
+"""
+import argparse
+import logging
+import os
+from importlib.util import find_spec
+
+import uvicorn
+
+logger = logging.getLogger("servidor")
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de produção da API de Adoção")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--timeout-graceful", type=int, default=30, help="segundos para terminar requests em andamento ao desligar")
+    parser.add_argument("--backlog", type=int, default=2048)
+    args = parser.parse_args()
+
+    # Em produção o echo do SQL vira gargalo de I/O; os workers herdam essa variável
+    os.environ.setdefault("SQL_ECHO", "false")
+
+    # uvloop/httptools vêm com `uvicorn[standard]` (dependência do projeto); sem eles cai nas implementações padrão
+    loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    if (loop, http) != ("uvloop", "httptools"):
+        logging.basicConfig(format="%(levelname)s:  %(message)s")
+        logger.warning(
+            "uvloop/httptools não instalados: usando %s/%s, com throughput menor por worker "
+            "(%d workers). Instale as dependências com `uv sync`.",
+            loop, http, args.workers,
+        )
+
+    # Cada worker importa o app do zero e cria o próprio engine no lifespan,
+    # que também aquece o pool e o cache de SQL antes de aceitar requests.
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.timeout_graceful,
+        access_log=False,
+        proxy_headers=True,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""Fila de tarefas para relatórios pesados.
+
+As tarefas ficam na tabela `tarefa` (persistida), então nada se perde se um
+processo cair: na inicialização as pendentes são reenviadas. Enquanto uma
+tarefa roda, o processo filho atualiza `batimento_em`; as que ficam em
+"executando" sem batimento por mais de TAREFA_TIMEOUT segundos são devolvidas
+para a fila por qualquer worker vivo, que confere isso periodicamente.
+Cada tarefa roda num ProcessPoolExecutor e grava o resultado em JSON gzip no
+disco local (RELATORIOS_DIR). O limite de tarefas rodando ao mesmo tempo
+(MAX_TAREFAS_EXECUTANDO) vale para todos os workers do servidor juntos, porque
+é conferido no banco na hora de marcar a tarefa como "executando".
+
+multiprocessing e concurrent.futures.process só são importados quando a
+primeira tarefa é enviada, para não pesar no import do app pelos workers.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import update, insert, or_, and_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, func
+
+from database import get_engine
+from eventos import versoes_atuais
+from modelos.tarefa import Tarefa, ParametrosRelatorio
+from modelos.versao import VersaoTabela
+from relatorios import RELATORIOS
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+RELATORIOS_DIR = Path(os.getenv("RELATORIOS_DIR", "relatorios_gerados"))
+MAX_TAREFAS_EXECUTANDO = int(os.getenv("MAX_TAREFAS_EXECUTANDO", "2"))  # rodando ao mesmo tempo, somando todos os workers
+TAREFAS_PROCESSOS = int(os.getenv("TAREFAS_PROCESSOS", str(MAX_TAREFAS_EXECUTANDO)))  # tamanho do pool de cada worker
+MAX_TAREFAS_ATIVAS = int(os.getenv("MAX_TAREFAS_ATIVAS", "20"))        # pendentes + executando
+TAREFA_TIMEOUT = int(os.getenv("TAREFA_TIMEOUT", "30"))  # segundos sem batimento até a tarefa ser dada como morta
+BATIMENTO = max(1.0, TAREFA_TIMEOUT / 6)  # intervalo entre os batimentos do processo filho
+INTERVALO_RECUPERACAO = TAREFA_TIMEOUT / 2  # cada worker procura tarefas órfãs neste intervalo
+MAX_TENTATIVAS = 3  # uma tarefa que derruba o processo filho não volta para a fila para sempre
+ESPERA_VAGA = 2.0  # segundos antes de tentar de novo quando o limite global está cheio
+ESPERA_REENVIO = 1.0  # segundos antes de reenviar após o pool quebrar; dobra a cada nova quebra
+
+STATUS_ATIVOS = ("pendente", "executando")
+
+class FilaCheiaError(Exception):
+    pass
+
+def calcular_chave(session: Session, relatorio: str, parametros: ParametrosRelatorio) -> str:
+    """Mesmo relatório + mesmos parâmetros + mesmas versões das tabelas = mesma chave."""
+    conteudo = {
+        "relatorio": relatorio,
+        "parametros": parametros.model_dump(),
+        "versoes": versoes_atuais(session),
+    }
+    return hashlib.sha256(json.dumps(conteudo, sort_keys=True).encode()).hexdigest()
+
+# Linha de VersaoTabela usada só como lock: quem a atualiza primeiro confere o limite
+# e marca a tarefa; os outros esperam o commit. Não entra na chave de cache dos relatórios.
+LOCK_FILA = "tarefa"
+
+def _ultimo_sinal():
+    return func.coalesce(Tarefa.batimento_em, Tarefa.iniciada_em)
+
+def _limite_sinal() -> datetime:
+    return datetime.now() - timedelta(seconds=TAREFA_TIMEOUT)
+
+def _reservar(session: Session, id_tarefa: int) -> bool | None:
+    """Marca a tarefa como "executando" se houver vaga. None = sem vaga; False = já foi pega."""
+    try:
+        resultado = session.exec(
+            update(VersaoTabela).where(VersaoTabela.tabela == LOCK_FILA).values(versao=VersaoTabela.versao + 1)
+        )
+        if resultado.rowcount == 0:
+            session.exec(insert(VersaoTabela).values(tabela=LOCK_FILA, versao=1))
+    except IntegrityError:
+        session.rollback()  # outro processo criou a linha agora; tenta na próxima rodada
+        return None
+
+    # "executando" sem batimento recente são de um processo que caiu e não ocupam vaga
+    executando = session.exec(
+        select(func.count(Tarefa.id_tarefa)).where(Tarefa.status == "executando", _ultimo_sinal() >= _limite_sinal())
+    ).one()
+    if executando >= MAX_TAREFAS_EXECUTANDO:
+        session.rollback()
+        return None
+
+    resultado = session.exec(
+        update(Tarefa)
+        .where(Tarefa.id_tarefa == id_tarefa, Tarefa.status == "pendente")
+        .values(status="executando", iniciada_em=datetime.now(), batimento_em=None, tentativas=Tarefa.tentativas + 1)
+    )
+    session.commit()
+    return resultado.rowcount > 0
+
+@contextmanager
+def _batimento(id_tarefa: int):
+    """Atualiza `batimento_em` numa thread enquanto o relatório roda no processo filho."""
+    parar = threading.Event()
+
+    def bater() -> None:
+        while not parar.wait(BATIMENTO):
+            try:
+                with Session(get_engine()) as session:
+                    session.exec(
+                        update(Tarefa)
+                        .where(Tarefa.id_tarefa == id_tarefa, Tarefa.status == "executando")
+                        .values(batimento_em=datetime.now())
+                    )
+                    session.commit()
+            except Exception:
+                logger.exception("Falha ao registrar batimento da tarefa %s", id_tarefa)
+
+    thread = threading.Thread(target=bater, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        parar.set()
+        thread.join()
+
+def _remover_resultados_antigos(session: Session, tarefa: Tarefa) -> None:
+    """Apaga os arquivos de execuções anteriores do mesmo relatório, já superadas por esta."""
+    antigas = session.exec(
+        select(Tarefa).where(
+            Tarefa.relatorio == tarefa.relatorio,
+            Tarefa.parametros == tarefa.parametros,
+            Tarefa.id_tarefa < tarefa.id_tarefa,
+            Tarefa.arquivo.is_not(None),
+        )
+    ).all()
+    for antiga in antigas:
+        Path(antiga.arquivo).unlink(missing_ok=True)
+        antiga.arquivo = None
+        session.add(antiga)
+
+def executar_tarefa(id_tarefa: int) -> bool:
+    """Roda no processo filho. Devolve False se não havia vaga (a tarefa continua pendente)."""
+    with Session(get_engine()) as session:
+        reservada = _reservar(session, id_tarefa)
+        if reservada is None:
+            return False
+        if not reservada:
+            return True  # já foi pega por outro processo
+
+        tarefa = session.get(Tarefa, id_tarefa)
+        try:
+            parametros = json.loads(tarefa.parametros)
+            # o batimento para antes de gravar o status: a thread não pode esperar pelo lock da própria linha
+            with _batimento(id_tarefa):
+                dados = RELATORIOS[tarefa.relatorio](session, **parametros)
+
+                RELATORIOS_DIR.mkdir(parents=True, exist_ok=True)
+                caminho = RELATORIOS_DIR / f"{id_tarefa}.json.gz"
+                temporario = caminho.with_suffix(".tmp")
+                with gzip.open(temporario, "wt", encoding="utf-8") as arquivo:
+                    json.dump(dados, arquivo, default=str, ensure_ascii=False)
+                os.replace(temporario, caminho)
+
+            tarefa.status = "concluida"
+            tarefa.arquivo = str(caminho)
+            _remover_resultados_antigos(session, tarefa)
+        except Exception as e:
+            session.rollback()
+            tarefa = session.get(Tarefa, id_tarefa)
+            tarefa.status = "erro"
+            tarefa.erro = str(e)
+        tarefa.concluida_em = datetime.now()
+        session.add(tarefa)
+        session.commit()
+    return True
+
+def _devolver_para_fila(session: Session, *condicoes) -> int:
+    """Tarefas interrompidas voltam a "pendente", ou viram "erro" se já esgotaram as tentativas.
+
+    Devolve quantas voltaram para a fila.
+    """
+    session.exec(
+        update(Tarefa)
+        .where(*condicoes, Tarefa.tentativas >= MAX_TENTATIVAS)
+        .values(status="erro", erro="Processo interrompido durante a execução", concluida_em=datetime.now())
+    )
+    resultado = session.exec(
+        update(Tarefa)
+        .where(*condicoes, Tarefa.tentativas < MAX_TENTATIVAS)
+        .values(status="pendente", iniciada_em=None, batimento_em=None)
+    )
+    session.commit()
+    return resultado.rowcount
+
+def _devolver_orfas(session: Session, *condicoes) -> list[int]:
+    """Devolve para a fila as tarefas "executando" sem batimento recente.
+
+    Cada uma é atualizada separadamente, com a condição de novo no UPDATE: quando
+    vários workers varrem ao mesmo tempo, só um deles fica com cada tarefa.
+    """
+    orfas = session.exec(
+        select(Tarefa.id_tarefa).where(*condicoes, Tarefa.status == "executando", _ultimo_sinal() < _limite_sinal())
+    ).all()
+    return [
+        id_tarefa for id_tarefa in orfas
+        if _devolver_para_fila(
+            session, Tarefa.id_tarefa == id_tarefa, Tarefa.status == "executando", _ultimo_sinal() < _limite_sinal()
+        )
+    ]
+
+def _marcar_erro(session: Session, id_tarefa: int, mensagem: str) -> None:
+    session.exec(
+        update(Tarefa)
+        .where(Tarefa.id_tarefa == id_tarefa, Tarefa.status.in_(STATUS_ATIVOS))
+        .values(status="erro", erro=mensagem, concluida_em=datetime.now())
+    )
+    session.commit()
+
+class GerenciadorTarefas:
+    def __init__(self, processos: int = TAREFAS_PROCESSOS):
+        self.processos = processos
+        # "principal" roda as tarefas; "isolado" (um processo) reexecuta uma por vez as que estavam
+        # rodando quando um pool quebrou, para que a próxima quebra tenha uma culpada certa
+        self._executores: dict[str, ProcessPoolExecutor] = {}  # criados no primeiro envio
+        self._enviadas: dict[ProcessPoolExecutor, set[int]] = {}
+        self._ativo = False
+        self._parar_vigia = threading.Event()
+        self._lock = threading.Lock()
+        # quebras em que a tarefa estava "executando", contadas aqui porque `tentativas`
+        # não distingue a tarefa que derrubou o processo das que rodavam ao lado dela
+        self._quebras: dict[int, int] = {}
+        # quebras seguidas de cada pool sem nenhuma tarefa iniciada: os processos nem conseguem subir
+        self._falhas_inicio: dict[str, int] = {}
+
+    def iniciar(self) -> None:
+        self._ativo = True
+        self.recuperar()
+        self._parar_vigia.clear()
+        threading.Thread(target=self._vigiar, name="tarefas-vigia", daemon=True).start()
+
+    def parar(self) -> None:
+        self._parar_vigia.set()
+        with self._lock:
+            self._ativo = False
+            # tarefas que não começaram continuam "pendente" no banco e rodam no próximo start
+            for executor in self._executores.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._executores.clear()
+            self._enviadas.clear()
+
+    def _novo_executor(self, processos: int) -> ProcessPoolExecutor:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn: o filho não herda threads/sockets do servidor
+        return ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn"))
+
+    def _abrir_pool(self, tipo: str) -> ProcessPoolExecutor:
+        # chamado com o lock
+        executor = self._novo_executor(1 if tipo == "isolado" else self.processos)
+        self._executores[tipo] = executor
+        self._enviadas[executor] = set()
+        return executor
+
+    def recuperar(self) -> None:
+        """Reenvia pendentes e devolve para a fila as tarefas órfãs em "executando"."""
+        with Session(get_engine()) as session:
+            _devolver_orfas(session)
+            pendentes = session.exec(
+                select(Tarefa.id_tarefa).where(Tarefa.status == "pendente").order_by(Tarefa.id_tarefa)
+            ).all()
+        for id_tarefa in pendentes:
+            self.enviar(id_tarefa)
+
+    def enviar(self, id_tarefa: int) -> None:
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._lock:
+            if not self._ativo:
+                return  # desligando; a tarefa segue pendente no banco
+            tipo = "isolado" if self._quebras.get(id_tarefa) else "principal"
+            executor = self._executores.get(tipo) or self._abrir_pool(tipo)
+            try:
+                futuro = executor.submit(executar_tarefa, id_tarefa)
+            except BrokenProcessPool:
+                executor = self._recriar_executor(tipo, executor)
+                futuro = executor.submit(executar_tarefa, id_tarefa)
+            self._enviadas[executor].add(id_tarefa)
+        futuro.add_done_callback(lambda f: self._ao_terminar(id_tarefa, tipo, executor, f))
+
+    def _vigiar(self) -> None:
+        """Enquanto o worker roda, devolve para a fila as tarefas cujo processo morreu."""
+        while not self._parar_vigia.wait(INTERVALO_RECUPERACAO):
+            try:
+                with Session(get_engine()) as session:
+                    devolvidas = _devolver_orfas(session)
+            except Exception:
+                logger.exception("Falha ao procurar tarefas órfãs")
+                continue
+            for id_tarefa in devolvidas:
+                logger.warning("Tarefa %s estava sem batimento; voltou para a fila", id_tarefa)
+                self.enviar(id_tarefa)
+
+    def _agendar(self, id_tarefa: int, espera: float) -> None:
+        timer = threading.Timer(espera, self.enviar, (id_tarefa,))
+        timer.daemon = True
+        timer.start()
+
+    def _recriar_executor(self, tipo: str, quebrado: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        # chamado com o lock; se outra thread já trocou o pool, só usa o novo
+        if self._executores.get(tipo) is not quebrado:
+            return self._executores.get(tipo) or self._abrir_pool(tipo)
+        quebrado.shutdown(wait=False, cancel_futures=True)
+        # roda antes de qualquer tarefa deste pool voltar para a fila, então o status ainda é o da quebra
+        ids = self._enviadas.pop(quebrado, set())
+        with Session(get_engine()) as session:
+            iniciadas = session.exec(
+                select(func.count(Tarefa.id_tarefa)).where(Tarefa.id_tarefa.in_(ids), Tarefa.status == "executando")
+            ).one() if ids else 0
+        self._falhas_inicio[tipo] = 0 if iniciadas else self._falhas_inicio.get(tipo, 0) + 1
+        return self._abrir_pool(tipo)
+
+    def _ao_terminar(self, id_tarefa: int, tipo: str, executor: ProcessPoolExecutor, futuro: Future) -> None:
+        from concurrent.futures.process import BrokenProcessPool
+
+        if futuro.cancelled():
+            return
+        erro = futuro.exception()
+        if erro is None:
+            with self._lock:
+                self._enviadas.get(executor, set()).discard(id_tarefa)
+                self._falhas_inicio[tipo] = 0
+            self._quebras.pop(id_tarefa, None)
+            if futuro.result() is False:
+                self._agendar(id_tarefa, ESPERA_VAGA)  # limite global cheio: tenta de novo depois
+            return
+        if not isinstance(erro, BrokenProcessPool):
+            logger.error("Tarefa %s falhou: %s", id_tarefa, erro)
+            return
+
+        # um processo filho morreu: recria o pool e devolve a tarefa para a fila
+        with self._lock:
+            if not self._ativo:
+                return
+            self._recriar_executor(tipo, executor)
+            falhas = self._falhas_inicio.get(tipo, 0)
+
+        with Session(get_engine()) as session:
+            status = session.exec(select(Tarefa.status).where(Tarefa.id_tarefa == id_tarefa)).one_or_none()
+            if status == "executando":
+                # estava rodando quando o processo morreu: pode ser a culpada
+                quebras = self._quebras[id_tarefa] = self._quebras.get(id_tarefa, 0) + 1
+                if quebras >= MAX_TENTATIVAS:
+                    logger.error("Pool de tarefas quebrou %s vezes com a tarefa %s rodando; desistindo", quebras, id_tarefa)
+                    self._quebras.pop(id_tarefa, None)
+                    _marcar_erro(session, id_tarefa, "Processo de relatório morreu repetidamente")
+                    return
+                _devolver_para_fila(session, Tarefa.id_tarefa == id_tarefa, Tarefa.status == "executando")
+                espera = ESPERA_REENVIO * 2 ** (quebras - 1)
+            elif status == "pendente":
+                # nem tinha começado: a quebra não conta contra a tarefa, só contra o pool
+                if falhas >= MAX_TENTATIVAS:
+                    logger.error("Pool de tarefas quebrou %s vezes sem iniciar nenhuma tarefa; desistindo da %s", falhas, id_tarefa)
+                    _marcar_erro(session, id_tarefa, "Processos de relatório não conseguem iniciar")
+                    return
+                espera = ESPERA_REENVIO * 2 ** max(falhas - 1, 0)
+            else:
+                return  # terminou antes da quebra
+
+        logger.warning("Pool de tarefas quebrado; reenviando tarefa %s em %.1fs", id_tarefa, espera)
+        self._agendar(id_tarefa, espera)
+
+    def submeter(self, session: Session, relatorio: str, parametros: ParametrosRelatorio) -> Tarefa:
+        """Cria (ou reaproveita) uma tarefa para o relatório com esses parâmetros."""
+        chave = calcular_chave(session, relatorio, parametros)
+
+        # uma igual que morreu em "executando" volta para a fila em vez de ser devolvida parada
+        for id_tarefa in _devolver_orfas(session, Tarefa.chave == chave):
+            self.enviar(id_tarefa)
+
+        existente = session.exec(
+            select(Tarefa)
+            .where(
+                Tarefa.chave == chave,
+                or_(
+                    Tarefa.status.in_(("pendente", "concluida")),
+                    and_(Tarefa.status == "executando", _ultimo_sinal() >= _limite_sinal()),
+                ),
+            )
+            .order_by(Tarefa.id_tarefa.desc())
+        ).first()
+        if existente and (existente.status != "concluida" or (existente.arquivo and Path(existente.arquivo).exists())):
+            return existente
+
+        ativas = session.exec(select(func.count(Tarefa.id_tarefa)).where(Tarefa.status.in_(STATUS_ATIVOS))).one()
+        if ativas >= MAX_TAREFAS_ATIVAS:
+            raise FilaCheiaError(f"Limite de {MAX_TAREFAS_ATIVAS} tarefas em andamento atingido")
+
+        tarefa = Tarefa(relatorio=relatorio, parametros=parametros.model_dump_json(), chave=chave)
+        session.add(tarefa)
+        session.commit()
+        session.refresh(tarefa)
+        self.enviar(tarefa.id_tarefa)
+        return tarefa
+
+gerenciador = GerenciadorTarefas()